@@ -9,18 +9,25 @@ What’s new vs. CSV version?
 
 Recommended runtime (macOS-friendly):
 - Python 3.11
-- numpy==1.26.4, pandas==2.2.2, streamlit==1.38.0, plotly==5.24.0
+- numpy==1.26.4, pandas==2.2.2, streamlit==1.38.0, plotly==5.24.0, pyarrow==17.0.0
 """
 from __future__ import annotations
 import io
+import itertools
 import math
+import os
 import sqlite3
+import uuid
+from contextlib import closing
 from datetime import datetime
+from pathlib import Path
 from typing import Optional
 
 import numpy as np
 import pandas as pd
 import plotly.express as px
+import pyarrow as pa
+import pyarrow.parquet as pq
 import streamlit as st
 
 DB_PATH_DEFAULT = "amazon.db"
@@ -28,9 +35,11 @@ DB_PATH_DEFAULT = "amazon.db"
 # ------------------------------
 # Data generation (for seeding)
 # ------------------------------
-def gen_sample_data(days: int = 90, skus: int = 120, seed: int = 42) -> pd.DataFrame:
+@st.cache_data(show_spinner=False)
+def gen_sample_data(end: str, days: int = 90, skus: int = 120, seed: int = 42) -> pd.DataFrame:
+    # `end` (YYYY-MM-DD) is an argument rather than today() so the cache key rolls over with the date
     rng = np.random.default_rng(seed)
-    start = pd.Timestamp.today().normalize() - pd.Timedelta(days=days)
+    start = pd.Timestamp(end).normalize() - pd.Timedelta(days=days)
     dates = pd.date_range(start, periods=days, freq="D")
 
     categories = ["Sarees", "Kurti", "Jewellery", "Home", "Beauty"]
@@ -47,60 +56,108 @@ def gen_sample_data(days: int = 90, skus: int = 120, seed: int = 42) -> pd.DataF
         "fulfillment": rng.choice(fulfill, size=skus),
     })
 
-    rows = []
-    for d in dates:
-        dow = d.weekday()
-        traffic_boost = 1.0 + (0.20 if dow in (5, 6) else 0.0)
-        promo = 1.0 + (0.35 if (d.day in (1, 15)) else 0.0)
-
-        for _, r in sku_meta.iterrows():
-            price = float(np.round(r.base_price * rng.uniform(0.85, 1.15), 2))
-            discount = float(max(0, 1 - price / max(r.base_price, 1)))
-            sessions = int(rng.poisson(30 * traffic_boost * promo))
-            ctr = rng.uniform(0.05, 0.16)
-            clicks = int(np.round(sessions * ctr))
-            atc_rate = rng.uniform(0.15, 0.45)
-            add_to_cart = int(np.round(clicks * atc_rate))
-            conv_rate = rng.uniform(0.18, 0.45)
-            units = int(np.round(add_to_cart * conv_rate))
-            returns = int(max(0, np.round(units * rng.uniform(0.03, 0.15))))
-            gmv = float(np.round(price * units, 2))
-            take_rate = float(np.round(rng.uniform(0.07, 0.15), 3))
-
-            rows.append({
-                "date": d.date(),
-                "sku_id": r.sku_id,
-                "title": r.title,
-                "brand": r.brand,
-                "category": r.category,
-                "price": price,
-                "discount": discount,
-                "sessions": sessions,
-                "clicks": clicks,
-                "add_to_cart": add_to_cart,
-                "units_ordered": units,
-                "units_returned": returns,
-                "gmv": gmv,
-                "fulfillment": r.fulfillment,
-                "region": "IN",
-                "take_rate": take_rate,
-            })
-
-    df = pd.DataFrame(rows)
+    # Per-day multipliers as (days, 1) columns so they broadcast across SKUs
+    weekday = dates.weekday.to_numpy()
+    traffic_boost = np.where(weekday >= 5, 1.20, 1.0)[:, None]
+    promo = np.where(np.isin(dates.day.to_numpy(), (1, 15)), 1.35, 1.0)[:, None]
+
+    shape = (days, skus)
+    base_price = sku_meta["base_price"].to_numpy()[None, :]
+    price = np.round(base_price * rng.uniform(0.85, 1.15, size=shape), 2)
+    discount = np.maximum(0, 1 - price / np.maximum(base_price, 1))
+    sessions = rng.poisson(30 * traffic_boost * promo, size=shape)
+    clicks = np.round(sessions * rng.uniform(0.05, 0.16, size=shape)).astype(np.int64)
+    add_to_cart = np.round(clicks * rng.uniform(0.15, 0.45, size=shape)).astype(np.int64)
+    units = np.round(add_to_cart * rng.uniform(0.18, 0.45, size=shape)).astype(np.int64)
+    returns = np.maximum(0, np.round(units * rng.uniform(0.03, 0.15, size=shape))).astype(np.int64)
+    gmv = np.round(price * units, 2)
+    take_rate = np.round(rng.uniform(0.07, 0.15, size=shape), 3)
+
+    def per_sku(col: str) -> np.ndarray:
+        return np.tile(sku_meta[col].to_numpy(), days)
+
+    df = pd.DataFrame({
+        "date": np.repeat(dates.values, skus),  # datetime64, no per-row date objects
+        "sku_id": per_sku("sku_id"),
+        "title": per_sku("title"),
+        "brand": per_sku("brand"),
+        "category": per_sku("category"),
+        "price": price.ravel(),
+        "discount": discount.ravel(),
+        "sessions": sessions.ravel(),
+        "clicks": clicks.ravel(),
+        "add_to_cart": add_to_cart.ravel(),
+        "units_ordered": units.ravel(),
+        "units_returned": returns.ravel(),
+        "gmv": gmv.ravel(),
+        "fulfillment": per_sku("fulfillment"),
+        "region": "IN",
+        "take_rate": take_rate.ravel(),
+    })
     return df
 
 
+SKU_METRICS_COLUMNS = [
+    "date", "sku_id", "title", "brand", "category", "price", "discount",
+    "sessions", "clicks", "add_to_cart", "units_ordered", "units_returned",
+    "gmv", "fulfillment", "region", "take_rate",
+]
+SKU_META_COLUMNS = ["sku_id", "title", "brand", "category"]
+# Additive measures kept per (date, category, brand, fulfillment) in daily_cube;
+# price_sum / price_n recover the average selling price after any roll-up
+CUBE_SUM_COLUMNS = ["sessions", "clicks", "add_to_cart", "units_ordered", "net_gmv", "platform_rev",
+                    "price_sum", "price_n"]
+SEED_CHUNK_ROWS = 50_000
+READ_CHUNK_ROWS = 50_000
+# date_i value for missing dates; below any real day, so range filters drop those rows
+NAT_EPOCH_DAY = np.iinfo(np.int32).min
+# Shared by seed_info and the Parquet mirror's schema metadata; the triggers clear seed_info on any write
+SEED_TOKEN_KEY = b"seed_token"
+SEED_TRIGGERS = [f"sku_metrics_{op.lower()}_unseed" for op in ("INSERT", "UPDATE", "DELETE")]
+# Low-cardinality text columns held as pandas categoricals once loaded
+CATEGORICAL_COLUMNS = ["brand", "category", "fulfillment", "region", "sku_id", "title"]
+# Narrowed numeric storage. Money (price, gmv, net_gmv, platform_rev) stays float64: groupby sums
+# keep the input dtype, and float32 totals drift by paise once they pass ~100k.
+FLOAT32_COLUMNS = ["discount", "take_rate", "net_units", "ctr", "conv_rate"]
+INT32_COLUMNS = ["sessions", "clicks", "add_to_cart", "units_ordered", "units_returned"]
+
+
+def parquet_path(db_path: str) -> str:
+    return db_path + ".parquet"
+
+
+def sku_meta_from_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """One row of descriptive attributes per sku_id (first occurrence wins)."""
+    return df.reindex(columns=SKU_META_COLUMNS).dropna(subset=["sku_id"]).drop_duplicates("sku_id")
+
+
 def seed_sqlite(db_path: str, df: Optional[pd.DataFrame] = None):
     """Create/overwrite a SQLite DB with a sku_metrics table and insert df or generated sample data."""
     if df is None:
-        df = gen_sample_data()
-
-    # Ensure proper dtypes
-    df = df.copy()
-    df["date"] = pd.to_datetime(df["date"]).dt.date
+        df = gen_sample_data(pd.Timestamp.today().strftime("%Y-%m-%d"))
+
+    # Ensure proper dtypes and column order for the positional INSERT
+    df = df.reindex(columns=SKU_METRICS_COLUMNS)
+    # Format each distinct day once rather than every row (rows share a handful of dates)
+    # normalize() first: timestamps with a time of day would otherwise map to duplicate labels
+    day = pd.to_datetime(df["date"]).dt.normalize().astype("category")
+    df["date"] = day.cat.rename_categories(day.cat.categories.strftime("%Y-%m-%d")).astype(object)
+
+    token = uuid.uuid4().hex
+    insert_sql = (
+        f"INSERT INTO sku_metrics ({', '.join(SKU_METRICS_COLUMNS)}) "
+        f"VALUES ({', '.join('?' * len(SKU_METRICS_COLUMNS))})"
+    )
 
-    with sqlite3.connect(db_path) as conn:
+    # isolation_level=None: we drive BEGIN/COMMIT ourselves so the whole load is one transaction
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
         cur = conn.cursor()
+        # Bulk-load settings; an in-memory rollback journal keeps ROLLBACK working (journal_mode=OFF
+        # would not), and the DB is rebuilt on reseed so fsync durability is not needed here
+        cur.execute("PRAGMA journal_mode=MEMORY;")
+        cur.execute("PRAGMA synchronous=OFF;")
+        cur.execute("PRAGMA temp_store=MEMORY;")
         cur.execute("""
             CREATE TABLE IF NOT EXISTS sku_metrics (
                 date TEXT,
@@ -121,12 +178,379 @@ def seed_sqlite(db_path: str, df: Optional[pd.DataFrame] = None):
                 take_rate REAL
             );
         """)
-        conn.commit()
-        # Clear previous data to make seeding idempotent
-        cur.execute("DELETE FROM sku_metrics;")
-        conn.commit()
 
-        df.to_sql("sku_metrics", conn, if_exists="append", index=False)
+        cur.execute("BEGIN TRANSACTION;")
+        try:
+            # The staleness triggers would fire per row during the reload; they are recreated below
+            for name in SEED_TRIGGERS:
+                cur.execute(f"DROP TRIGGER IF EXISTS {name};")
+            # Clear previous data to make seeding idempotent
+            cur.execute("DELETE FROM sku_metrics;")
+            rows = df.itertuples(index=False, name=None)
+            while True:
+                chunk = list(itertools.islice(rows, SEED_CHUNK_ROWS))
+                if not chunk:
+                    break
+                cur.executemany(insert_sql, chunk)
+            # Per-SKU attributes, so sku-level views join them instead of aggregating strings
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS sku_meta (
+                    sku_id TEXT PRIMARY KEY,
+                    title TEXT,
+                    brand TEXT,
+                    category TEXT
+                );
+            """)
+            cur.execute("DELETE FROM sku_meta;")
+            cur.executemany(
+                f"INSERT INTO sku_meta ({', '.join(SKU_META_COLUMNS)}) VALUES (?, ?, ?, ?)",
+                sku_meta_from_frame(df).itertuples(index=False, name=None),
+            )
+            # Pre-aggregated daily cube; same net_gmv/platform_rev formulas as add_derivations(). It stands
+            # in for a full-range price band, and BETWEEN never matches NULL, so NULL-price rows are left out.
+            cur.execute("DROP TABLE IF EXISTS daily_cube;")
+            cur.execute("""
+                CREATE TABLE daily_cube AS
+                SELECT date, category, brand, fulfillment,
+                       SUM(sessions) AS sessions,
+                       SUM(clicks) AS clicks,
+                       SUM(add_to_cart) AS add_to_cart,
+                       SUM(units_ordered) AS units_ordered,
+                       SUM(gmv - IFNULL(price, 0) * IFNULL(units_returned, 0)) AS net_gmv,
+                       SUM((gmv - IFNULL(price, 0) * IFNULL(units_returned, 0)) * IFNULL(take_rate, 0)) AS platform_rev,
+                       TOTAL(price) AS price_sum,
+                       COUNT(price) AS price_n
+                FROM sku_metrics
+                WHERE price IS NOT NULL
+                GROUP BY date, category, brand, fulfillment
+                ORDER BY date;
+            """)
+            # Built after the load; serves the sidebar filters pushed into SQL
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_sku_metrics_date_cat
+                ON sku_metrics(date, category, brand, fulfillment);
+            """)
+            # sku_meta, daily_cube and the Parquet mirror are only valid while seed_info holds this token;
+            # any later write to sku_metrics clears it
+            cur.execute("CREATE TABLE IF NOT EXISTS seed_info (token TEXT NOT NULL);")
+            cur.execute("DELETE FROM seed_info;")
+            cur.execute("INSERT INTO seed_info (token) VALUES (?);", (token,))
+            for name, op in zip(SEED_TRIGGERS, ("INSERT", "UPDATE", "DELETE")):
+                cur.execute(f"""
+                    CREATE TRIGGER {name} AFTER {op} ON sku_metrics
+                    BEGIN DELETE FROM seed_info; END;
+                """)
+            cur.execute("COMMIT;")
+        except Exception:
+            cur.execute("ROLLBACK;")
+            raise
+    finally:
+        conn.close()
+
+    # Columnar mirror for fast reads, stamped with the same token so a copy from another seed is ignored
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), SEED_TOKEN_KEY: token.encode()})
+    pq.write_table(table, parquet_path(db_path), compression="zstd")
+
+
+# ------------------------------
+# Loading (cached across reruns)
+# ------------------------------
+def numeric_column(df: pd.DataFrame, col: str, default: float = 0.0, na_value: float = np.nan) -> np.ndarray:
+    """Column as a float64 array; a constant array if the source lacks the column."""
+    if col not in df.columns:
+        return np.full(len(df), default, dtype=np.float64)
+    return df[col].to_numpy(dtype=np.float64, na_value=na_value)
+
+
+def safe_ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """num / den, NaN wherever den is not positive."""
+    return np.divide(num, den, out=np.full(len(num), np.nan), where=den > 0)
+
+
+def add_derivations(df: pd.DataFrame) -> pd.DataFrame:
+    """Add net/platform revenue and funnel-rate columns used across the dashboard."""
+    if "gmv" not in df.columns and {"price", "units_ordered"}.issubset(df.columns):
+        df["gmv"] = df["price"] * df["units_ordered"]
+
+    units = numeric_column(df, "units_ordered")
+    net_units = units - numeric_column(df, "units_returned")
+    df["net_units"] = net_units
+    if "gmv" in df.columns:
+        df["net_gmv"] = (numeric_column(df, "gmv")
+                         - numeric_column(df, "price", na_value=0) * numeric_column(df, "units_returned", na_value=0))
+    else:
+        df["net_gmv"] = numeric_column(df, "price") * net_units
+
+    if "take_rate" not in df.columns:
+        df["take_rate"] = 0.10
+    df["platform_rev"] = df["net_gmv"].to_numpy() * numeric_column(df, "take_rate", na_value=0)
+
+    df["ctr"] = safe_ratio(numeric_column(df, "clicks"), numeric_column(df, "sessions"))
+    df["conv_rate"] = safe_ratio(units, numeric_column(df, "add_to_cart"))
+    return df
+
+
+def to_epoch_days(dates) -> np.ndarray:
+    """Dates as int32 days since 1970-01-01 (missing -> NAT_EPOCH_DAY)."""
+    days = pd.to_datetime(pd.Series(dates)).to_numpy(dtype="datetime64[D]")
+    out = days.astype(np.int64)
+    out[np.isnat(days)] = NAT_EPOCH_DAY
+    return out.astype(np.int32)
+
+
+def add_date_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize `date` to datetime.date for display and add `date_i` for filtering/grouping."""
+    # to_datetime: an empty DB result comes back with an object-dtype date column
+    dates = pd.to_datetime(df["date"])
+    df["date"] = dates.dt.date
+    df["date_i"] = to_epoch_days(dates)
+    return df
+
+
+def aggregate_sorted_runs(frame: pd.DataFrame, key: str, sum_cols: list) -> pd.DataFrame:
+    """Group by `key` using contiguous runs: sort once (usually a no-op), then np.add.reduceat per column.
+
+    `key` must not hold NaN (date_i marks missing dates with NAT_EPOCH_DAY); NaN values are skipped,
+    matching pandas groupby sum.
+    """
+    if not frame[key].is_monotonic_increasing:
+        frame = frame.sort_values(key, kind="stable")
+    keys = frame[key].to_numpy()
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+    out = {key: keys[starts]}
+    for col in sum_cols:
+        values = frame[col].to_numpy()
+        if values.dtype.kind in "iu":
+            out[col] = np.add.reduceat(values, starts, dtype=np.int64)
+        else:
+            out[col] = np.add.reduceat(np.nan_to_num(values, nan=0.0), starts, dtype=np.float64)
+    return pd.DataFrame(out)
+
+
+def long_form(frame: pd.DataFrame, id_col: str, metrics: list) -> pd.DataFrame:
+    """Melt selected metric columns into (id, metric, value) rows for plotly."""
+    return frame.melt(id_vars=id_col, value_vars=metrics, var_name="metric", value_name="value")
+
+
+def optimize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Store repeated labels as categoricals and numbers in 32 bits to halve scan bandwidth."""
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    for col in FLOAT32_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(np.float32)
+    for col in INT32_COLUMNS:
+        if col in df.columns:
+            # Counts with gaps (e.g. blank CSV cells) arrive as float; keep them nullable via float32
+            is_int = pd.api.types.is_integer_dtype(df[col])
+            df[col] = df[col].astype(np.int32 if is_int else np.float32)
+    return df
+
+
+def category_mask(col: pd.Series, selected) -> np.ndarray:
+    """isin() for a categorical column: resolve the selection to codes once, then compare integers."""
+    allowed = col.cat.categories.get_indexer(selected)
+    return np.isin(col.cat.codes.to_numpy(), allowed[allowed >= 0])
+
+
+def unique_sorted(df: pd.DataFrame, col: str) -> list:
+    return sorted(df.get(col, pd.Series(dtype=str)).dropna().unique().tolist())
+
+
+def compute_facets(df: pd.DataFrame) -> dict:
+    """Distinct values and ranges backing the sidebar filters."""
+    return {
+        "min_date": df["date"].min(),
+        "max_date": df["date"].max(),
+        "cats": unique_sorted(df, "category"),
+        "brands": unique_sorted(df, "brand"),
+        "fulfills": unique_sorted(df, "fulfillment"),
+        "min_price": float(df.get("price", pd.Series([0])).min()),
+        "max_price": float(df.get("price", pd.Series([0])).max()),
+    }
+
+
+def date_bounds(sel_date) -> tuple[str, str]:
+    """Half-open ['YYYY-MM-DD', next day) range for the selected days.
+
+    Stored dates may carry a time part ('2026-10-14 00:00:00' from DataFrame.to_sql), which sorts after
+    '2026-10-14'; an exclusive next-day upper bound keeps the whole last day.
+    """
+    lo = pd.Timestamp(sel_date[0]).normalize()
+    hi = pd.Timestamp(sel_date[1]).normalize() + pd.Timedelta(days=1)
+    return lo.strftime("%Y-%m-%d"), hi.strftime("%Y-%m-%d")
+
+
+def build_where(sel_date, sel_cat, sel_brand, sel_fulfill, price_band=None) -> tuple[str, tuple]:
+    """Translate the sidebar selection into a parameterized WHERE clause.
+
+    price_band=None leaves out the price predicate (daily_cube has no per-row price).
+    """
+    clauses = ["date >= ? AND date < ?"]
+    params = list(date_bounds(sel_date))
+    if price_band is not None:
+        clauses.append("price BETWEEN ? AND ?")
+        params.extend([float(price_band[0]), float(price_band[1])])
+    for col, values in (("category", sel_cat), ("brand", sel_brand), ("fulfillment", sel_fulfill)):
+        if values:
+            clauses.append(f"{col} IN ({', '.join('?' * len(values))})")
+            params.extend(values)
+    return " AND ".join(clauses), tuple(params)
+
+
+def build_parquet_filters(sel_date, sel_cat, sel_brand, sel_fulfill, price_band) -> list:
+    """Same predicates as build_where, in pyarrow's filter format."""
+    lo_date, hi_date = date_bounds(sel_date)
+    filters = [
+        ("date", ">=", lo_date), ("date", "<", hi_date),
+        ("price", ">=", float(price_band[0])), ("price", "<=", float(price_band[1])),
+    ]
+    for col, values in (("category", sel_cat), ("brand", sel_brand), ("fulfillment", sel_fulfill)):
+        if values:
+            filters.append((col, "in", list(values)))
+    return filters
+
+
+def connect_readonly(db_path: str) -> sqlite3.Connection:
+    """Open the DB read-only with settings suited to the dashboard's full-range scans."""
+    # as_uri() percent-encodes '#', '?' and '%' that would otherwise be parsed as URI syntax
+    conn = sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+    conn.execute("PRAGMA mmap_size=268435456;")  # 256 MB: read pages straight from the OS page cache
+    conn.execute("PRAGMA cache_size=-65536;")    # 64 MB page cache
+    conn.execute("PRAGMA temp_store=MEMORY;")    # sorts/DISTINCT without temp files
+    return conn
+
+
+# The DB file's mtime is part of every cache key, so a reseed invalidates all of them.
+def seed_token(db_path: str) -> Optional[str]:
+    """Token of the last seed_sqlite run, or None if sku_metrics was written to (or replaced) since."""
+    with closing(connect_readonly(db_path)) as conn:
+        try:
+            # A replaced table takes its triggers with it, so require them as well as the token
+            row = conn.execute(
+                f"SELECT token FROM seed_info WHERE (SELECT COUNT(*) FROM sqlite_master "
+                f"WHERE type = 'trigger' AND name IN ({', '.join('?' * len(SEED_TRIGGERS))})) = ?",
+                (*SEED_TRIGGERS, len(SEED_TRIGGERS)),
+            ).fetchone()
+        except sqlite3.DatabaseError:
+            return None
+    return row[0] if row else None
+
+
+def mirror_is_current(db_path: str, token: Optional[str]) -> bool:
+    """True if the Parquet mirror was written by the same seed as the DB's current token."""
+    pq_path = parquet_path(db_path)
+    if token is None or not os.path.exists(pq_path):
+        return False
+    try:
+        metadata = pq.read_schema(pq_path).metadata or {}
+    except (OSError, ValueError):
+        return False
+    return metadata.get(SEED_TOKEN_KEY) == token.encode()
+
+
+@st.cache_data(show_spinner=False)
+def load_facets(db_path: str, mtime: float) -> dict:
+    """Sidebar facets straight from SQLite: a few DISTINCT/MIN/MAX queries, no row transfer."""
+    with closing(connect_readonly(db_path)) as conn:
+        def distinct(col: str) -> list:
+            sql = f"SELECT DISTINCT {col} FROM sku_metrics WHERE {col} IS NOT NULL ORDER BY 1"
+            return [row[0] for row in conn.execute(sql)]
+
+        min_date, max_date, min_price, max_price = conn.execute(
+            "SELECT MIN(date), MAX(date), MIN(price), MAX(price) FROM sku_metrics"
+        ).fetchone()
+        return {
+            "min_date": pd.Timestamp(min_date).date(),
+            "max_date": pd.Timestamp(max_date).date(),
+            "cats": distinct("category"),
+            "brands": distinct("brand"),
+            "fulfills": distinct("fulfillment"),
+            "min_price": float(min_price or 0),
+            "max_price": float(max_price or 0),
+        }
+
+
+@st.cache_data(show_spinner=False)
+def load_sku_meta(db_path: str, mtime: float) -> pd.DataFrame:
+    seeded = seed_token(db_path) is not None
+    with closing(connect_readonly(db_path)) as conn:
+        if seeded:
+            return pd.read_sql(f"SELECT {', '.join(SKU_META_COLUMNS)} FROM sku_meta", conn)
+        # Tables loaded or edited by hand since the last seed (see README) may have SKUs that sku_meta
+        # lacks; derive it from the rows instead
+        return pd.read_sql(
+            "SELECT sku_id, MIN(title) AS title, MIN(brand) AS brand, MIN(category) AS category "
+            "FROM sku_metrics WHERE sku_id IS NOT NULL GROUP BY sku_id",
+            conn,
+        )
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def load_filtered(db_path: str, mtime: float, sel_date, sel_cat, sel_brand, sel_fulfill, price_band) -> pd.DataFrame:
+    if mirror_is_current(db_path, seed_token(db_path)):
+        # Parquet mirror is current: vectorized columnar read with the filters pushed into the scan
+        filters = build_parquet_filters(sel_date, sel_cat, sel_brand, sel_fulfill, price_band)
+        df = add_derivations(pd.read_parquet(parquet_path(db_path), filters=filters, memory_map=True))
+    else:
+        where, params = build_where(sel_date, sel_cat, sel_brand, sel_fulfill, price_band)
+        # Stream the slice so the driver's row tuples never exceed one chunk
+        with closing(connect_readonly(db_path)) as conn:
+            chunks = pd.read_sql(f"SELECT * FROM sku_metrics WHERE {where}", conn,
+                                 params=params, parse_dates=["date"], chunksize=READ_CHUNK_ROWS)
+            df = pd.concat([add_derivations(chunk) for chunk in chunks], ignore_index=True)
+    return optimize_dtypes(add_date_columns(df))
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def load_cube(db_path: str, mtime: float, sel_date, sel_cat, sel_brand, sel_fulfill) -> Optional[pd.DataFrame]:
+    """Slice of daily_cube for the filters, or None if the DB predates the cube or changed since seeding."""
+    if seed_token(db_path) is None:
+        return None
+    where, params = build_where(sel_date, sel_cat, sel_brand, sel_fulfill)
+    with closing(connect_readonly(db_path)) as conn:
+        try:
+            df = pd.read_sql(f"SELECT * FROM daily_cube WHERE {where} ORDER BY date", conn, params=params)
+        except pd.errors.DatabaseError:
+            return None
+    # Not passed through optimize_dtypes(): the rows are already few and the sums are float64 totals
+    return add_date_columns(df)
+
+
+def cube_from_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate row-level data to daily_cube's grain (day, category, brand) for the shared daily views."""
+    agg = {col: (col, "sum") for col in CUBE_SUM_COLUMNS if col in df.columns}
+    if "price" in df.columns:
+        agg["price_sum"] = ("price", "sum")
+        agg["price_n"] = ("price", "count")
+    # Sorted by date_i, as aggregate_sorted_runs() expects; NaN category/brand rows still count in totals
+    cube = df.groupby(["date_i", "category", "brand"], observed=True, dropna=False).agg(**agg).reset_index()
+    for col in CUBE_SUM_COLUMNS:
+        if col not in cube.columns:
+            cube[col] = 0
+    return cube
+
+
+@st.cache_data(show_spinner=False)
+def load_csv(data: bytes) -> pd.DataFrame:
+    # Arrow's multithreaded parser; columns still land as NumPy dtypes for optimize_dtypes()
+    df = pd.read_csv(io.BytesIO(data), engine="pyarrow")
+    if "date" in df.columns:
+        df = add_date_columns(df)
+    return optimize_dtypes(add_derivations(df))
+
+
+@st.cache_data(show_spinner=False)
+def load_csv_facets(data: bytes) -> dict:
+    return compute_facets(load_csv(data))
+
+
+@st.cache_data(show_spinner=False)
+def load_csv_sku_meta(data: bytes) -> pd.DataFrame:
+    return sku_meta_from_frame(load_csv(data))
 
 
 # ------------------------------
@@ -176,83 +600,82 @@ if source_mode == "SQLite DB":
     
     # Load data from database
     try:
-        with sqlite3.connect(db_path) as conn:
-            df = pd.read_sql("SELECT * FROM sku_metrics", conn, parse_dates=["date"])
-            df["date"] = df["date"].dt.date
+        db_mtime = os.path.getmtime(db_path)
+        facets = load_facets(db_path, db_mtime)
+        sku_meta = load_sku_meta(db_path, db_mtime)
     except Exception as e:
         st.error(f"Error loading data: {e}")
         st.stop()
 else:
     if uploaded is not None:
-        df = pd.read_csv(uploaded)
-        if "date" in df.columns:
-            df["date"] = pd.to_datetime(df["date"]).dt.date
+        csv_bytes = uploaded.getvalue()
+        df = load_csv(csv_bytes)
+        facets = load_csv_facets(csv_bytes)
+        sku_meta = load_csv_sku_meta(csv_bytes)
     else:
         st.info("Upload a CSV from the sidebar to proceed.")
         st.stop()
 
-# Derivations
-if "gmv" not in df.columns and {"price", "units_ordered"}.issubset(df.columns):
-    df["gmv"] = df["price"] * df["units_ordered"]
-
-df["net_units"] = df.get("units_ordered", 0) - df.get("units_returned", 0)
-df["net_gmv"] = np.where("gmv" in df.columns,
-                         df["gmv"] - df["price"].fillna(0) * df.get("units_returned", 0).fillna(0),
-                         df.get("price", 0) * df["net_units"])
-
-if "take_rate" not in df.columns:
-    df["take_rate"] = 0.10
-df["platform_rev"] = df["net_gmv"] * df["take_rate"].fillna(0)
-
-df["ctr"] = np.where(df.get("sessions", 0) > 0, df.get("clicks", 0) / df.get("sessions", 1), np.nan)
-df["conv_rate"] = np.where(df.get("add_to_cart", 0) > 0, df.get("units_ordered", 0) / df.get("add_to_cart", 1), np.nan)
-
 # Sidebar filters
 st.sidebar.header("🔍 Filters")
-min_date, max_date = df["date"].min(), df["date"].max()
+min_date, max_date = facets["min_date"], facets["max_date"]
 sel_date = st.sidebar.date_input("Date range", value=(min_date, max_date), min_value=min_date, max_value=max_date)
 if not isinstance(sel_date, (list, tuple)):
     sel_date = (min_date, max_date)
 
-cats = sorted(df.get("category", pd.Series(dtype=str)).dropna().unique().tolist())
-brands = sorted(df.get("brand", pd.Series(dtype=str)).dropna().unique().tolist())
-fulfills = sorted(df.get("fulfillment", pd.Series(dtype=str)).dropna().unique().tolist())
+cats, brands, fulfills = facets["cats"], facets["brands"], facets["fulfills"]
 
 sel_cat = st.sidebar.multiselect("Category", cats, default=cats[:2] if cats else [])
 sel_brand = st.sidebar.multiselect("Brand", brands)
 sel_fulfill = st.sidebar.multiselect("Fulfillment", fulfills)
 
-min_price = float(df.get("price", pd.Series([0])).min())
-max_price = float(df.get("price", pd.Series([0])).max())
+min_price, max_price = facets["min_price"], facets["max_price"]
 price_band = st.sidebar.slider("Price band", min_value=float(int(min_price)), max_value=float(math.ceil(max_price)), value=(float(int(min_price)), float(math.ceil(max_price))))
 
-mask = (
-    (df["date"] >= sel_date[0]) & (df["date"] <= sel_date[1])
-)
-if sel_cat:
-    mask &= df["category"].isin(sel_cat)
-if sel_brand:
-    mask &= df["brand"].isin(sel_brand)
-if sel_fulfill:
-    mask &= df["fulfillment"].isin(sel_fulfill)
-mask &= df.get("price", 0).between(price_band[0], price_band[1])
-
-fdf = df.loc[mask].copy()
+if source_mode == "SQLite DB":
+    # Filters run in the storage layer; only the matching rows are fetched
+    try:
+        fdf = load_filtered(db_path, db_mtime, sel_date, sel_cat, sel_brand, sel_fulfill, price_band)
+        # The cube has no per-row price, so it only answers when the price band spans everything
+        full_price_band = price_band[0] <= min_price and price_band[1] >= max_price
+        cube = load_cube(db_path, db_mtime, sel_date, sel_cat, sel_brand, sel_fulfill) if full_price_band else None
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        st.stop()
+else:
+    # Plain NumPy bool arrays throughout: no index alignment when combining
+    lo_day, hi_day = to_epoch_days(sel_date[:2])
+    date_i = df["date_i"].to_numpy()
+    mask = date_i >= lo_day
+    mask &= date_i <= hi_day
+    if sel_cat:
+        mask &= category_mask(df["category"], sel_cat)
+    if sel_brand:
+        mask &= category_mask(df["brand"], sel_brand)
+    if sel_fulfill:
+        mask &= category_mask(df["fulfillment"], sel_fulfill)
+    mask &= df.get("price", pd.Series(0, index=df.index)).between(price_band[0], price_band[1]).to_numpy()
+
+    # Boolean indexing already materializes a new frame and nothing below mutates fdf
+    fdf = df.loc[mask]
+    cube = None
+
+# Trends, anomalies, breakdowns and KPI totals read the (small) cube; sku-level views read fdf
+if cube is None:
+    cube = cube_from_rows(fdf)
 
 # KPI header
 def kpi(val, label, helptext=None, fmt="{:,.0f}"):
     st.metric(label=label, value=(fmt.format(val) if val is not None and not np.isnan(val) else "–"), help=helptext)
 
 left, mid1, mid2, right1, right2 = st.columns(5)
-sessions = float(fdf.get("sessions", pd.Series([0])).sum())
-clicks = float(fdf.get("clicks", pd.Series([0])).sum())
+# All KPI totals in one reduction over the cube
+totals = cube[CUBE_SUM_COLUMNS].sum().astype(float)
+sessions, clicks, atc, units = totals[["sessions", "clicks", "add_to_cart", "units_ordered"]]
+net_gmv, platform_rev = totals["net_gmv"], totals["platform_rev"]
 ctr = clicks / sessions if sessions > 0 else np.nan
-atc = float(fdf.get("add_to_cart", pd.Series([0])).sum())
-units = float(fdf.get("units_ordered", pd.Series([0])).sum())
 conv = units / atc if atc > 0 else np.nan
-net_gmv = float(fdf.get("net_gmv", pd.Series([0.0])).sum())
-platform_rev = float(fdf.get("platform_rev", pd.Series([0.0])).sum())
-asp = (fdf.get("price", pd.Series([np.nan])).mean())
+asp = totals["price_sum"] / totals["price_n"] if totals["price_n"] > 0 else np.nan
 
 with left:
     kpi(sessions, "Sessions", "Total sessions")
@@ -268,35 +691,38 @@ with right2:
 # Trends
 st.subheader("Trends")
 if not fdf.empty:
-    by_day = fdf.groupby("date").agg({
-        "sessions": "sum",
-        "clicks": "sum",
-        "add_to_cart": "sum",
-        "units_ordered": "sum",
-        "net_gmv": "sum",
-        "platform_rev": "sum",
-        "price": "mean"
-    }).reset_index()
+    # One pass per grouping key; later sections reuse these frames instead of re-grouping
+    # Cube and DB/Parquet slices arrive date-ordered, so this is a sequential scan over contiguous runs
+    by_day = aggregate_sorted_runs(cube, "date_i", sum_cols=CUBE_SUM_COLUMNS)
+    by_day.insert(0, "date", pd.to_datetime(by_day.pop("date_i"), unit="D").dt.date)
+    by_day["price"] = safe_ratio(by_day.pop("price_sum").to_numpy(), by_day.pop("price_n").to_numpy())
     by_day["ctr"] = by_day["clicks"] / by_day["sessions"]
     by_day["conv"] = by_day["units_ordered"] / by_day["add_to_cart"].replace(0, np.nan)
 
+    # Long form up front so plotly doesn't re-melt and re-infer the wide frame per chart
+    funnel_long = long_form(by_day, "date", ["sessions", "clicks", "add_to_cart", "units_ordered"])
+    revenue_long = long_form(by_day, "date", ["net_gmv", "platform_rev"])
+
     t1, t2 = st.columns(2)
     with t1:
-        fig = px.line(by_day, x="date", y=["sessions", "clicks", "add_to_cart", "units_ordered"], title="Funnel Counts Over Time")
+        fig = px.line(funnel_long, x="date", y="value", color="metric", title="Funnel Counts Over Time")
         st.plotly_chart(fig, use_container_width=True)
     with t2:
-        fig2 = px.line(by_day, x="date", y=["net_gmv", "platform_rev"], title="Net GMV & Platform Revenue Over Time")
+        fig2 = px.line(revenue_long, x="date", y="value", color="metric", title="Net GMV & Platform Revenue Over Time")
         st.plotly_chart(fig2, use_container_width=True)
 
     # Elasticity proxy
     st.subheader("Price vs Units (Elasticity Proxy)")
-    price_units = fdf.groupby(["sku_id", "title"], as_index=False).agg({
-        "price": "mean",
-        "units_ordered": "sum",
-        "sessions": "sum",
-        "brand": "first",
-        "category": "first"
-    })
+    # Numeric aggregates only; title/brand/category are constant per SKU and joined from sku_meta
+    by_sku = fdf.groupby("sku_id", observed=True).agg(
+        price=("price", "mean"),
+        units_ordered=("units_ordered", "sum"),
+        net_gmv=("net_gmv", "sum"),
+        sessions=("sessions", "sum"),
+        clicks=("clicks", "sum"),
+    ).reset_index()
+    by_sku = by_sku.merge(sku_meta, on="sku_id", how="left")
+    price_units = by_sku[["sku_id", "title", "price", "units_ordered", "sessions", "brand", "category"]]
 
     fig3 = px.scatter(
         price_units,
@@ -309,12 +735,8 @@ if not fdf.empty:
 
     # Movers
     st.subheader("Top Movers — Units & GMV")
-    movers = fdf.groupby(["sku_id", "title"]).agg({
-        "units_ordered": "sum",
-        "net_gmv": "sum",
-        "sessions": "sum",
-        "clicks": "sum"
-    }).reset_index().sort_values("units_ordered", ascending=False).head(20)
+    movers = by_sku[["sku_id", "title", "units_ordered", "net_gmv", "sessions", "clicks"]] \
+        .sort_values("units_ordered", ascending=False).head(20)
     st.dataframe(movers, use_container_width=True)
 else:
     st.info("No data after filters.")
@@ -322,10 +744,13 @@ else:
 # Anomalies
 st.subheader("Anomalies — Daily Net GMV")
 if not fdf.empty:
-    series = fdf.groupby("date")["net_gmv"].sum().reset_index()
-    mu, sd = series["net_gmv"].mean(), series["net_gmv"].std(ddof=0)
-    series["z"] = (series["net_gmv"] - mu) / (sd if sd > 0 else 1)
-    series["anomaly"] = series["z"].abs() >= 2.0
+    series = by_day[["date", "net_gmv"]].copy()
+    # |z| >= 2  <=>  (x - mu)^2 >= 4 * var: squared deviations feed both the variance and the
+    # mask, with no sqrt, division or abs. A flat series (var == 0) has no anomalies.
+    x = series["net_gmv"].to_numpy(dtype=np.float64)
+    dev2 = np.square(x - x.mean())
+    var = dev2.mean()
+    series["anomaly"] = (dev2 >= 4.0 * var) & (var > 0)
     fig4 = px.bar(series, x="date", y="net_gmv", color="anomaly", title="Days with ±2σ anomalies highlighted")
     st.plotly_chart(fig4, use_container_width=True)
     if series["anomaly"].any():
@@ -335,20 +760,18 @@ if not fdf.empty:
 st.subheader("Breakdowns")
 colA, colB = st.columns(2)
 if not fdf.empty:
-    by_cat = fdf.groupby("category").agg({
-        "sessions": "sum", "clicks": "sum", "add_to_cart": "sum",
-        "units_ordered": "sum", "net_gmv": "sum"
-    }).reset_index()
+    breakdown_cols = ["sessions", "clicks", "add_to_cart", "units_ordered", "net_gmv"]
+    # Single scan of the cube; the per-category and per-brand tables roll up this small frame
+    by_cat_brand = cube.groupby(["category", "brand"], observed=True, dropna=False)[breakdown_cols].sum()
+
+    by_cat = by_cat_brand.groupby(level="category", observed=True).sum().reset_index()
     by_cat["CTR %"] = (by_cat["clicks"] / by_cat["sessions"].replace(0, np.nan)) * 100
     by_cat["Conv %"] = (by_cat["units_ordered"] / by_cat["add_to_cart"].replace(0, np.nan)) * 100
     with colA:
         st.markdown("**By Category**")
         st.dataframe(by_cat.sort_values("net_gmv", ascending=False), use_container_width=True)
 
-    by_brand = fdf.groupby("brand").agg({
-        "sessions": "sum", "clicks": "sum", "add_to_cart": "sum",
-        "units_ordered": "sum", "net_gmv": "sum"
-    }).reset_index()
+    by_brand = by_cat_brand.groupby(level="brand", observed=True).sum().reset_index()
     by_brand["CTR %"] = (by_brand["clicks"] / by_brand["sessions"].replace(0, np.nan)) * 100
     by_brand["Conv %"] = (by_brand["units_ordered"] / by_brand["add_to_cart"].replace(0, np.nan)) * 100
     with colB: